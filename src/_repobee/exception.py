@@ -11,14 +11,21 @@ itself extends :py:class:`Exception`. In other words, exceptions raised within
 """
 import os
 import sys
-import re
+
+_NL = os.linesep
+_DEFAULT_ENCODING = sys.getdefaultencoding()
+_NL_BYTES = _NL.encode(_DEFAULT_ENCODING)
+_FATAL = b"fatal:"
+_HTTPS = "https://"
 
 
 class RepoBeeException(Exception):
     """Base exception for all repobee exceptions."""
 
+    __slots__ = ("msg",)
+
     def __init__(self, msg="", *args, **kwargs):
-        super().__init__(self, msg, *args, **kwargs)
+        super().__init__(msg, *args, **kwargs)
         self.msg = msg
 
     def __str__(self):
@@ -41,16 +48,18 @@ class GitError(RepoBeeException):
     status.
     """
 
+    __slots__ = ("returncode", "stderr")
+
     def __init__(self, msg: str, returncode: int, stderr: bytes):
-        stderr_decoded = stderr.decode(encoding=sys.getdefaultencoding()) or ""
-        fatal = re.findall("fatal:.*", stderr_decoded)
-        # either fatal reason or first line of error message
-        err = fatal[0] if fatal else stderr_decoded.split(os.linesep)[0]
+        # either fatal reason or first line of error message, only that line
+        # is decoded as stderr may be large
+        line = _fatal_line(stderr) or stderr.partition(_NL_BYTES)[0]
+        err = line.decode(_DEFAULT_ENCODING, errors="replace")
 
         # sanitize from secure token
-        err = re.sub("https://.*?@", "https://", err)
+        err = _sanitize_token(err)
 
-        msg_ = f"{msg}{os.linesep}return code: {returncode}{os.linesep}{err}"
+        msg_ = f"{msg}{_NL}return code: {returncode}{_NL}{err}"
         super().__init__(msg_)
         self.returncode = returncode
         self.stderr = stderr
@@ -59,6 +68,8 @@ class GitError(RepoBeeException):
 class CloneFailedError(GitError):
     """An error to raise when cloning a repository fails."""
 
+    __slots__ = ("clone_spec",)
+
     def __init__(self, msg: str, returncode: int, stderr: bytes, clone_spec):
         self.clone_spec = clone_spec
         super().__init__(msg, returncode, stderr)
@@ -67,6 +78,8 @@ class CloneFailedError(GitError):
 class PushFailedError(GitError):
     """An error to raise when pushing to a remote fails."""
 
+    __slots__ = ("url",)
+
     def __init__(self, msg: str, returncode: int, stderr: bytes, url: str):
         self.url = url
         super().__init__(msg, returncode, stderr)
@@ -76,3 +89,36 @@ class PluginLoadError(RepoBeeException):
     """Generic error to raise when something goes wrong with loading
     plugins.
     """
+
+
+def _fatal_line(stderr: bytes) -> bytes:
+    """Return the first line of stderr that starts with ``fatal:``, or an
+    empty bytes object if there is no such line.
+    """
+    if stderr.startswith(_FATAL):
+        start = 0
+    else:
+        start = stderr.find(b"\n" + _FATAL)
+        if start < 0:
+            return b""
+        start += 1
+
+    end = stderr.find(b"\n", start)
+    return stderr[start:end] if end >= 0 else stderr[start:]
+
+
+def _sanitize_token(text: str) -> str:
+    """Remove credentials from all URLs on the form
+    ``https://<credentials>@<host>`` in text.
+    """
+    parts = []
+    pos = 0
+    while True:
+        start = text.find(_HTTPS, pos)
+        at = text.find("@", start + len(_HTTPS)) if start >= 0 else -1
+        if at < 0:
+            break
+        parts.append(text[pos : start + len(_HTTPS)])
+        pos = at + 1
+    parts.append(text[pos:])
+    return "".join(parts)
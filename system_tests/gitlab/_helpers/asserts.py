@@ -1,52 +1,66 @@
 """Assert functions for integration tests."""
+import concurrent.futures
+import functools
 import itertools
 import pathlib
 
-from typing import List
+from typing import FrozenSet, List, Tuple
 
-import gitlab
 import repobee_plug as plug
 
 from repobee_testhelpers.funcs import hash_directory
 from repobee_testhelpers._internal import templates
 
-from .const import ORG_NAME, LOCAL_BASE_URL, TOKEN, TEACHER
-from .helpers import get_group
+from .const import ORG_NAME, TEACHER, MAX_CONCURRENT_REQUESTS
+from .helpers import get_group, gitlab_instance
+
+
+@functools.lru_cache(maxsize=None)
+def _expected_repo_names(
+    student_teams: Tuple[plug.StudentTeam, ...],
+    assignment_names: Tuple[str, ...],
+) -> FrozenSet[str]:
+    return frozenset(plug.generate_repo_names(student_teams, assignment_names))
 
 
 def assert_template_repos_exist(assignment_names, org_name):
     """Assert that the template repos are in the specified group."""
     group = get_group(org_name)
     actual_repo_names = [g.name for g in group.projects.list(all=True)]
-    assert sorted(actual_repo_names) == sorted(assignment_names)
+    assert len(actual_repo_names) == len(assignment_names)
+    assert set(actual_repo_names) == set(assignment_names)
 
 
 def assert_repos_exist(student_teams, assignment_names, org_name=ORG_NAME):
     """Assert that the associated student repos exist."""
-    repo_names = plug.generate_repo_names(student_teams, assignment_names)
-    gl = gitlab.Gitlab(LOCAL_BASE_URL, private_token=TOKEN, ssl_verify=False)
-    target_group = get_group(org_name, gl=gl)
-    student_groups = gl.groups.list(id=target_group.id)
+    repo_names = _expected_repo_names(
+        tuple(student_teams), tuple(assignment_names)
+    )
+    target_group = get_group(org_name)
 
-    projects = [p for g in student_groups for p in g.projects.list(all=True)]
+    projects = target_group.projects.list(
+        include_subgroups=True, all=True, per_page=100
+    )
     project_names = [p.name for p in projects]
 
-    assert set(project_names) == set(repo_names)
+    assert set(project_names) == repo_names
 
 
 def assert_repos_contain(
     student_teams, assignment_names, filename, text, org=ORG_NAME
 ):
     """Assert that each of the student repos contain the given file."""
-    repo_names = plug.generate_repo_names(student_teams, assignment_names)
-    gl = gitlab.Gitlab(LOCAL_BASE_URL, private_token=TOKEN, ssl_verify=False)
-    target_group = get_group(org, gl=gl)
-    student_groups = gl.groups.list(id=target_group.id)
+    repo_names = _expected_repo_names(
+        tuple(student_teams), tuple(assignment_names)
+    )
+    gl = gitlab_instance()
+    target_group = get_group(org)
 
     projects = [
         gl.projects.get(p.id)
-        for g in student_groups
-        for p in g.projects.list(all=True)
+        for p in target_group.projects.list(
+            include_subgroups=True, all=True, per_page=100
+        )
         if p.name in repo_names
     ]
     assert len(projects) == len(repo_names)
@@ -74,8 +88,8 @@ def assert_on_groups(
     ``expected`` teams and asserts them against all ``actual`` groups. If
     provided, this is used INSTEAD of the default all-groups assertion.
     """
-    gl = gitlab.Gitlab(LOCAL_BASE_URL, private_token=TOKEN, ssl_verify=False)
-    target_group = get_group(org_name, gl=gl)
+    gl = gitlab_instance()
+    target_group = get_group(org_name)
     sorted_teams = sorted(list(student_teams), key=lambda t: t.name)
     team_names = set(t.name for t in sorted_teams)
 
@@ -91,9 +105,7 @@ def assert_on_groups(
     if all_groups_assertion:
         all_groups_assertion(sorted_teams, sorted_groups)
     else:
-        assert set(g.name for g in sorted_groups) == set(
-            str(team) for team in sorted_teams
-        )
+        assert set(g.name for g in sorted_groups) == team_names
     for group, team in zip(sorted_groups, sorted_teams):
         # the user who owns the OAUTH token is always listed as a member
         # of groups he/she creates
@@ -112,19 +124,39 @@ def _assert_on_projects(student_teams, assignment_names, assertion):
     """Execute the specified assertion operation on a project. Assertion should
     be a callable taking precisely on project as an argument.
     """
-    gl = gitlab.Gitlab(LOCAL_BASE_URL, private_token=TOKEN, ssl_verify=False)
-    repo_names = plug.generate_repo_names(student_teams, assignment_names)
-    target_group = get_group(ORG_NAME, gl=gl)
-    student_groups = gl.groups.list(id=target_group.id)
-    projects = [
-        gl.projects.get(p.id)
-        for g in student_groups
-        for p in g.projects.list(all=True)
+    projects_manager = gitlab_instance().projects
+    repo_names = _expected_repo_names(
+        tuple(student_teams), tuple(assignment_names)
+    )
+    target_group = get_group(ORG_NAME)
+    # lazy projects suffice as the assertions only access sub-managers
+    projects = (
+        projects_manager.get(p.id, lazy=True)
+        for p in target_group.projects.list(
+            include_subgroups=True, as_list=False, per_page=100
+        )
         if p.name in repo_names
-    ]
+    )
 
-    for proj in projects:
-        assertion(proj)
+    # the assertions are independent and I/O bound, so they run concurrently.
+    # At most MAX_CONCURRENT_REQUESTS are in flight at a time such that the
+    # projects generator is consumed page by page, and result() re-raises
+    # any assertion failure
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=MAX_CONCURRENT_REQUESTS
+    ) as executor:
+        pending = set()
+        for project in projects:
+            if len(pending) >= MAX_CONCURRENT_REQUESTS:
+                done, pending = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    future.result()
+            pending.add(executor.submit(assertion, project))
+
+        for future in concurrent.futures.as_completed(pending):
+            future.result()
 
 
 def assert_issues_exist(
@@ -139,20 +171,21 @@ def assert_issues_exist(
     """
 
     def assertion(project):
-        issues = project.issues.list(all=True)
-        for actual_issue in issues:
-            if actual_issue.title == expected_issue.title:
-                assert actual_issue.state == expected_state
-                assert actual_issue.description == expected_issue.body
-                # FIXME This assert always fails in CI, but not locally. I
-                # can't figure out why.
-                # assert len(actual_issue.assignees) == expected_num_asignees
-                assert TEACHER not in [
-                    asignee["username"] for asignee in actual_issue.assignees
-                ]
-
-                return
-        assert False, "no issue matching the specified title"
+        issues = project.issues.list(search=expected_issue.title, all=True)
+        actual_issue = next(
+            (i for i in issues if i.title == expected_issue.title), None
+        )
+        assert (
+            actual_issue is not None
+        ), "no issue matching the specified title"
+        assert actual_issue.state == expected_state
+        assert actual_issue.description == expected_issue.body
+        # FIXME This assert always fails in CI, but not locally. I
+        # can't figure out why.
+        # assert len(actual_issue.assignees) == expected_num_asignees
+        assert TEACHER not in [
+            asignee["username"] for asignee in actual_issue.assignees
+        ]
 
     _assert_on_projects(student_teams, assignment_names, assertion)
 
@@ -163,7 +196,9 @@ def assert_num_issues(student_teams, assignment_names, num_issues):
     """
 
     def assertion(project):
-        assert len(project.issues.list(all=True)) == num_issues
+        # only the X-Total header of the first page is needed for the count
+        issues = project.issues.list(as_list=False, per_page=1)
+        assert issues.total == num_issues
 
     _assert_on_projects(student_teams, assignment_names, assertion)
 
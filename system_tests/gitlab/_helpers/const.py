@@ -2,6 +2,7 @@
 import pathlib
 
 import repobee_plug as plug
+import repobee_plug.cli
 
 from repobee_testhelpers._internal.templates import TEMPLATE_REPOS_DIR
 
@@ -18,6 +19,8 @@ LOCAL_BASE_URL = "https://" + LOCAL_DOMAIN
 ORG_NAME = "dd1337-fall2020"
 TEMPLATE_ORG_NAME = "dd1337-master"
 TEACHER = "ric"
+# both the number of assertion threads and the HTTP connection pool size
+MAX_CONCURRENT_REQUESTS = 16
 assignment_names = [p.name for p in TEMPLATE_REPOS_DIR.iterdir() if p.is_dir()]
 TEMPLATE_REPO_PATHS = list(
     dir_.absolute() for dir_ in TEMPLATE_REPOS_DIR.iterdir() if dir_.is_dir()
@@ -34,3 +37,13 @@ BASE_ARGS = [*BASE_ARGS_NO_TB, "--tb"]
 STUDENTS_ARG = ["-s", " ".join(STUDENT_TEAM_NAMES)]
 MASTER_REPOS_ARG = ["-a", " ".join(assignment_names)]
 TEMPLATE_ORG_ARG = ["--template-org-name", TEMPLATE_ORG_NAME]
+SETUP_COMMAND = " ".join(
+    [
+        REPOBEE_GITLAB,
+        *repobee_plug.cli.CoreCommand.repos.setup.as_name_tuple(),
+        *BASE_ARGS,
+        *TEMPLATE_ORG_ARG,
+        *MASTER_REPOS_ARG,
+        *STUDENTS_ARG,
+    ]
+)
@@ -1,15 +1,15 @@
 """Helper functions for the integration tests."""
+import functools
 import os
 import pathlib
-import shlex
 import subprocess
 import sys
 import tempfile
 
-from typing import Optional
-
 import _repobee.ext
 import gitlab
+import requests
+import requests.adapters
 
 from .const import (
     ORG_NAME,
@@ -19,6 +19,7 @@ from .const import (
     BASE_DOMAIN,
     LOCAL_DOMAIN,
     TEACHER,
+    MAX_CONCURRENT_REQUESTS,
 )
 
 
@@ -27,24 +28,42 @@ def api_instance(org_name=ORG_NAME):
     return _repobee.ext.gitlab.GitLabAPI(LOCAL_BASE_URL, TOKEN, org_name)
 
 
+@functools.lru_cache(maxsize=None)
+def gitlab_instance() -> gitlab.Gitlab:
+    """Return a gitlab instance for the local GitLab server. The instance is
+    shared by all callers, such that the underlying connection pool is reused.
+    The pool is sized to keep a connection alive for each concurrent request.
+    """
+    session = requests.Session()
+    session.mount(
+        "https://",
+        requests.adapters.HTTPAdapter(pool_maxsize=MAX_CONCURRENT_REQUESTS),
+    )
+    return gitlab.Gitlab(
+        LOCAL_BASE_URL, private_token=TOKEN, ssl_verify=False, session=session
+    )
+
+
 def gitlab_and_groups():
     """Return a valid gitlab instance, along with the master group and the
     target group.
     """
-    gl = gitlab.Gitlab(LOCAL_BASE_URL, private_token=TOKEN, ssl_verify=False)
-    master_group = get_group(TEMPLATE_ORG_NAME, gl=gl)
-    target_group = get_group(ORG_NAME, gl=gl)
+    gl = gitlab_instance()
+    master_group = get_group(TEMPLATE_ORG_NAME)
+    target_group = get_group(ORG_NAME)
     return gl, master_group, target_group
 
 
-def get_group(group_slug: str, gl: Optional[gitlab.Gitlab] = None):
-    """Return a group with the given slug."""
-    gl = gl or gitlab.Gitlab(
-        LOCAL_BASE_URL, private_token=TOKEN, ssl_verify=False
-    )
+@functools.lru_cache(maxsize=None)
+def get_group(group_slug: str):
+    """Return a group with the given slug.
+
+    The result is cached, so ``get_group.cache_clear()`` must be called
+    whenever the GitLab instance is restored.
+    """
     return [
         group
-        for group in gl.groups.list(search=group_slug)
+        for group in gitlab_instance().groups.list(search=group_slug)
         if group.path == group_slug or group.full_path == group_slug
     ][0]
 
@@ -57,17 +76,18 @@ def run_in_docker_with_coverage(command, extra_args=None):
     return run_in_docker(coverage_command, extra_args=extra_args)
 
 
-def run_in_docker(command, extra_args=None):
-    extra_args = " ".join(extra_args) if extra_args else ""
-    docker_command = (
-        "docker run {} --net development --rm --name repobee "
-        "repobee:test /bin/sh -c '{}'"
-    ).format(extra_args, command)
-    print(docker_command)
+def run_in_docker(command, extra_args=()):
+    docker_command = [
+        *"docker run".split(),
+        *extra_args,
+        *"--net development --rm --name repobee repobee:test".split(),
+        "/bin/sh",
+        "-c",
+        command,
+    ]
+    print(" ".join(docker_command))
     proc = subprocess.run(
-        shlex.split(docker_command),
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
+        docker_command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
     )
     print(
         proc.stdout.decode(sys.getdefaultencoding())
@@ -77,7 +97,7 @@ def run_in_docker(command, extra_args=None):
 
 def update_repo(repo_name, filename, text):
     """Add a file with the given filename and text to the repo."""
-    gl = gitlab.Gitlab(LOCAL_BASE_URL, private_token=TOKEN, ssl_verify=False)
+    gl = gitlab_instance()
     proj, *_ = [
         p for p in gl.projects.list(search=repo_name) if p.name == repo_name
     ]
@@ -2,7 +2,6 @@
 import os
 import pathlib
 
-import gitlab
 import pytest
 import repobee_plug as plug
 
@@ -19,20 +18,18 @@ from _helpers.const import (
     COVERAGE_VOLUME_DST,
     REPOBEE_GITLAB,
     BASE_ARGS,
-    TEMPLATE_ORG_ARG,
-    MASTER_REPOS_ARG,
     STUDENTS_ARG,
     STUDENT_TEAMS,
     assignment_names,
-    LOCAL_BASE_URL,
-    TOKEN,
     ORG_NAME,
     STUDENT_TEAM_NAMES,
+    SETUP_COMMAND,
 )
 from _helpers.helpers import (
     run_in_docker,
     expected_num_members_group_assertion,
     get_group,
+    gitlab_instance,
 )
 
 assert os.getenv(
@@ -59,20 +56,21 @@ def restore():
     state.
     """
     gitlabmanager.restore()
+    get_group.cache_clear()
 
 
 @pytest.fixture
 def tmpdir_volume_arg(tmpdir):
-    """Create a temporary directory and return an argument string that
-    will mount a docker volume to it.
+    """Create a temporary directory and return the arguments that will
+    mount a docker volume to it.
     """
-    yield "-v {}:{}".format(str(tmpdir), VOLUME_DST)
+    yield ["-v", "{}:{}".format(str(tmpdir), VOLUME_DST)]
 
 
 @pytest.fixture(scope="module", autouse=True)
 def coverage_volume():
     covdir = pathlib.Path(".").resolve() / ".coverage_files"
-    yield "-v {}:{}".format(str(covdir), COVERAGE_VOLUME_DST)
+    yield ["-v", "{}:{}".format(str(covdir), COVERAGE_VOLUME_DST)]
     covfile = covdir / ".coverage"
     assert covfile.is_file()
 
@@ -84,12 +82,12 @@ def generate_coverage_report(coverage_volume):
     # xml report for Codecov
     run_in_docker(
         "cd {} && coverage xml".format(COVERAGE_VOLUME_DST),
-        extra_args=[coverage_volume],
+        extra_args=coverage_volume,
     )
     # txt report for manual inspection
     run_in_docker(
         "cd {} && coverage report > report.txt".format(COVERAGE_VOLUME_DST),
-        extra_args=[coverage_volume],
+        extra_args=coverage_volume,
     )
 
 
@@ -110,7 +108,7 @@ def handle_coverage_file(extra_args):
 @pytest.fixture
 def extra_args(tmpdir_volume_arg, coverage_volume):
     """Extra arguments to pass to run_in_docker when executing a test."""
-    return [tmpdir_volume_arg, coverage_volume]
+    return [*tmpdir_volume_arg, *coverage_volume]
 
 
 @pytest.fixture
@@ -120,18 +118,7 @@ def with_student_repos(restore):
     Note that explicitly including restore here is necessary to ensure that
     it runs before this fixture.
     """
-    command = " ".join(
-        [
-            REPOBEE_GITLAB,
-            *str(repobee_plug.cli.CoreCommand.repos.setup).split(),
-            *BASE_ARGS,
-            *TEMPLATE_ORG_ARG,
-            *MASTER_REPOS_ARG,
-            *STUDENTS_ARG,
-        ]
-    )
-
-    result = run_in_docker(command)
+    result = run_in_docker(SETUP_COMMAND)
 
     # pre-test asserts
     assert result.returncode == 0
@@ -149,11 +136,13 @@ def open_issues(with_student_repos):
         title="Correction required", body="You need to fix this, this and that"
     )
     issues = [task_issue, correction_issue]
-    gl = gitlab.Gitlab(LOCAL_BASE_URL, private_token=TOKEN, ssl_verify=False)
-    target_group = get_group(ORG_NAME, gl=gl)
+    projects_manager = gitlab_instance().projects
+    target_group = get_group(ORG_NAME)
     projects = (
-        gl.projects.get(p.id)
-        for p in target_group.projects.list(include_subgroups=True, all=True)
+        projects_manager.get(p.id, lazy=True)
+        for p in target_group.projects.list(
+            include_subgroups=True, as_list=False, per_page=100
+        )
     )
     for project in projects:
         project.issues.create(
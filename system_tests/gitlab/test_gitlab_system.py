@@ -40,6 +40,7 @@ from _helpers.const import (
     MASTER_REPOS_ARG,
     TEMPLATE_ORG_ARG,
     TEACHER,
+    SETUP_COMMAND,
 )
 from _helpers.helpers import (
     api_instance,
@@ -186,18 +187,9 @@ class TestSetup:
 
     def test_clean_setup(self, extra_args):
         """Test a first-time setup with master repos in the master org."""
-        command = " ".join(
-            [
-                REPOBEE_GITLAB,
-                *repobee_plug.cli.CoreCommand.repos.setup.as_name_tuple(),
-                *BASE_ARGS,
-                *TEMPLATE_ORG_ARG,
-                *MASTER_REPOS_ARG,
-                *STUDENTS_ARG,
-            ]
+        result = run_in_docker_with_coverage(
+            SETUP_COMMAND, extra_args=extra_args
         )
-
-        result = run_in_docker_with_coverage(command, extra_args=extra_args)
         assert result.returncode == 0
         assert_repos_exist(STUDENT_TEAMS, assignment_names)
         assert_on_groups(STUDENT_TEAMS)
@@ -238,19 +230,12 @@ class TestSetup:
 
     def test_setup_twice(self, extra_args):
         """Setting up twice should have the same effect as setting up once."""
-        command = " ".join(
-            [
-                REPOBEE_GITLAB,
-                *repobee_plug.cli.CoreCommand.repos.setup.as_name_tuple(),
-                *BASE_ARGS,
-                *TEMPLATE_ORG_ARG,
-                *MASTER_REPOS_ARG,
-                *STUDENTS_ARG,
-            ]
+        result = run_in_docker_with_coverage(
+            SETUP_COMMAND, extra_args=extra_args
+        )
+        result = run_in_docker_with_coverage(
+            SETUP_COMMAND, extra_args=extra_args
         )
-
-        result = run_in_docker_with_coverage(command, extra_args=extra_args)
-        result = run_in_docker_with_coverage(command, extra_args=extra_args)
         assert result.returncode == 0
         assert_repos_exist(STUDENT_TEAMS, assignment_names)
         assert_on_groups(STUDENT_TEAMS)
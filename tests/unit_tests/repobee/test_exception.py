@@ -15,6 +15,13 @@ def test_repobee_exception_repr():
     assert repr(exc) == expected_repr
 
 
+def test_repobee_exception_args_does_not_contain_exception():
+    msg = "an exception message"
+    exc = exception.RepoBeeException(msg)
+
+    assert exc.args == (msg,)
+
+
 class TestGitError:
     """Tests for GitError."""
 
@@ -118,3 +125,164 @@ class TestGitError:
         assert token not in str(err)
         assert USER not in str(err)
         assert str(err) == expected_msg
+
+    def test_all_tokens_on_line_are_sanitized(self):
+        """Test that the tokens are removed from every URL on the line, and
+        not only from the first one.
+        """
+        tokens = ["032957238hfibwt8374", "ab7381bfe9d"]
+        returncode = 128
+        fatal_template = "fatal: could not push from https://{}a.com to {}"
+        remote_url_template = "https://{}b.com/some-repo"
+        fatal = fatal_template.format(
+            tokens[0] + "@",
+            remote_url_template.format(f"{USER}:{tokens[1]}@"),
+        )
+        msg = "something went wrong!"
+        stderr = f"some lines\n{fatal}\nlast line".encode(
+            sys.getdefaultencoding()
+        )
+        expected_msg = (
+            f"{msg}{os.linesep}return code: {returncode}{os.linesep}"
+            + fatal_template.format("", remote_url_template.format(""))
+        )
+
+        err = exception.GitError(msg, returncode, stderr)
+
+        assert all(token not in str(err) for token in tokens)
+        assert str(err) == expected_msg
+
+    def test_url_without_credentials_is_not_altered(self):
+        """Test that a URL without an ``@`` is left as-is."""
+        fatal = "fatal: repo 'https://some-host.com/some-repo' not found"
+        msg = "something went wrong!"
+        returncode = 128
+        stderr = f"some lines\n{fatal}\nlast line".encode(
+            sys.getdefaultencoding()
+        )
+        expected_msg = (
+            f"{msg}{os.linesep}return code: {returncode}{os.linesep}{fatal}"
+        )
+
+        err = exception.GitError(msg, returncode, stderr)
+
+        assert str(err) == expected_msg
+
+    def test_fatal_message_on_first_line_is_picked(self):
+        fatal = "fatal: this is the part we want!"
+        msg = "something went wrong!"
+        returncode = 128
+        stderr = f"{fatal}\nmore lines".encode(sys.getdefaultencoding())
+        expected_msg = (
+            f"{msg}{os.linesep}return code: {returncode}{os.linesep}{fatal}"
+        )
+
+        err = exception.GitError(msg, returncode, stderr)
+
+        assert str(err) == expected_msg
+
+    def test_fatal_message_on_last_line_without_newline_is_picked(self):
+        fatal = "fatal: this is the part we want!"
+        msg = "something went wrong!"
+        returncode = 128
+        stderr = f"some lines\nmore lines\n{fatal}".encode(
+            sys.getdefaultencoding()
+        )
+        expected_msg = (
+            f"{msg}{os.linesep}return code: {returncode}{os.linesep}{fatal}"
+        )
+
+        err = exception.GitError(msg, returncode, stderr)
+
+        assert str(err) == expected_msg
+
+    def test_first_line_is_picked_if_there_is_no_fatal_message(self):
+        first_line = "error: this is the part we want!"
+        msg = "something went wrong!"
+        returncode = 1
+        stderr = os.linesep.join(
+            [first_line, "more lines", "last line"]
+        ).encode(sys.getdefaultencoding())
+        expected_msg = (
+            f"{msg}{os.linesep}return code: "
+            f"{returncode}{os.linesep}{first_line}"
+        )
+
+        err = exception.GitError(msg, returncode, stderr)
+
+        assert str(err) == expected_msg
+
+    def test_fatal_in_middle_of_line_is_not_picked(self):
+        """Test that only a line that starts with ``fatal:`` is picked as the
+        fatal message.
+        """
+        first_line = "some lines"
+        msg = "something went wrong!"
+        returncode = 128
+        stderr = os.linesep.join(
+            [first_line, "remote: fatal: not this one", "last line"]
+        ).encode(sys.getdefaultencoding())
+        expected_msg = (
+            f"{msg}{os.linesep}return code: "
+            f"{returncode}{os.linesep}{first_line}"
+        )
+
+        err = exception.GitError(msg, returncode, stderr)
+
+        assert str(err) == expected_msg
+
+    def test_invalid_bytes_are_replaced(self):
+        """Test that undecodable bytes in the picked line are replaced
+        instead of raising.
+        """
+        msg = "something went wrong!"
+        returncode = 128
+        stderr = b"some lines\nfatal: bad \xff byte\nlast line"
+        expected_msg = (
+            f"{msg}{os.linesep}return code: "
+            f"{returncode}{os.linesep}fatal: bad � byte"
+        )
+
+        err = exception.GitError(msg, returncode, stderr)
+
+        assert str(err) == expected_msg
+
+    def test_bytes_outside_picked_line_do_not_affect_message(self):
+        """Test that non-ASCII and undecodable bytes in other lines of stderr
+        do not end up in, or break, the message.
+        """
+        fatal = "fatal: unable to access 'https://some-host.com/rëpo'"
+        msg = "something went wrong!"
+        returncode = 128
+        stderr = (
+            b"\xff\xfe garbage \xc3\n"
+            + "remote: Försök igen\n".encode("utf8")
+            + fatal.encode("utf8")
+            + b"\n\xe2\x82 truncated"
+        )
+        expected_msg = (
+            f"{msg}{os.linesep}return code: {returncode}{os.linesep}{fatal}"
+        )
+
+        err = exception.GitError(msg, returncode, stderr)
+
+        assert str(err) == expected_msg
+        assert err.stderr == stderr
+
+    def test_first_line_with_invalid_bytes_in_later_lines(self):
+        first_line = "error: pathspec 'ä' did not match"
+        msg = "something went wrong!"
+        returncode = 1
+        stderr = (
+            first_line.encode("utf8")
+            + os.linesep.encode("utf8")
+            + b"\xff\xfe garbage"
+        )
+        expected_msg = (
+            f"{msg}{os.linesep}return code: "
+            f"{returncode}{os.linesep}{first_line}"
+        )
+
+        err = exception.GitError(msg, returncode, stderr)
+
+        assert str(err) == expected_msg